@@ -1,20 +1,50 @@
 #!/usr/bin/env python3
 
 import argparse
+import gzip
+import hashlib
+import importlib.util
 import json
 import logging
+import mmap
 import os
 import random
+import select
+import shutil
 import signal
+import socket
 import sys
 import time
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Optional
 
 import httpx
 
+# httpx enables HTTP/2 when h2 is installed and decodes "br" when brotli is.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_ACCEPT_ENCODING = "gzip, br" if importlib.util.find_spec("brotli") is not None else "gzip"
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+USER_AGENT = "accrescent-checker/1"
+
+# Buffered parsing beats ijson streaming with any JSON backend; only stream
+# uncompressed bodies whose declared length is at least this large.
+STREAM_MIN_BYTES = 32 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+STATE_SCHEMA = 2
+
+# Returned by fetch_apps in place of the apps dict when the server answers 304
+# or the payload is byte-identical to the previous one.
+NOT_MODIFIED = object()
 
 try:
     import fcntl
@@ -22,9 +52,6 @@ try:
     def _lock_shared(fp):
         fcntl.flock(fp.fileno(), fcntl.LOCK_SH)
 
-    def _lock_exclusive(fp):
-        fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
-
     def _unlock(fp):
         fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
 
@@ -33,19 +60,54 @@ except (ImportError, AttributeError):
     def _lock_shared(_):
         return None
 
-    def _lock_exclusive(_):
-        return None
-
     def _unlock(_):
         return None
 
 
-def setup_logging(log_file: str, level: str = "INFO") -> None:
-    """Set up rotating file logging with specified level."""
+try:
+    import orjson
+
+    def _json_loads(data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def _json_dumps(data: Any) -> bytes:
+        return orjson.dumps(data)
+
+except ImportError:
+
+    def _json_loads(data: bytes) -> Any:
+        return json.loads(bytes(data))
+
+    def _json_dumps(data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _gzip_namer(name: str) -> str:
+    return f"{name}.gz"
+
+
+def _gzip_rotator(source: str, dest: str) -> None:
+    """Compress a rotated log file into its backup slot."""
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def setup_logging(log_file: Optional[str], level: str = "INFO") -> None:
+    """Set up rotating, gzip-compressed file logging, or none if log_file is None."""
     root = logging.getLogger()
     if root.handlers:
         return
 
+    if log_file is None:
+        # Nothing reads records, so disable every level and let the
+        # isEnabledFor checks in _emit/notify skip formatting entirely.
+        root.addHandler(logging.NullHandler())
+        root.setLevel(logging.CRITICAL + 1)
+        return
+
+    root.setLevel(level.upper())
+
     Path(log_file).parent.mkdir(exist_ok=True, parents=True)
 
     handler = RotatingFileHandler(
@@ -53,118 +115,367 @@ def setup_logging(log_file: str, level: str = "INFO") -> None:
         maxBytes=10 * 1024 * 1024,
         backupCount=3,
         encoding="utf-8",
+        delay=True,
     )
+    handler.namer = _gzip_namer
+    handler.rotator = _gzip_rotator
     handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
     root.addHandler(handler)
-    root.setLevel(level.upper())
     root.propagate = False
 
 
-def _emit(msg: str, *, level: int = logging.INFO, quiet: bool = False) -> None:
-    """Emit message to both console (if not quiet) and log."""
+def _emit(fmt: str, *args: Any, level: int = logging.INFO, quiet: bool = False) -> None:
+    """Emit message to both console (if not quiet) and log, formatting lazily."""
+    log = logger.isEnabledFor(level)
+    if quiet and not log:
+        return
+    msg = fmt % args if args else fmt
     if not quiet:
         print(msg)
-    logging.log(level, msg)
+    if log:
+        logger.log(level, msg)
 
 
-def _atomic_json_dump(path: str, data: Any) -> None:
-    """Atomically write JSON data to file with file locking."""
-    Path(path).parent.mkdir(exist_ok=True, parents=True)
+def _atomic_json_dump(path: str, data: Any, *, durable: bool = False) -> None:
+    """Atomically write JSON data to file via rename, fsyncing only if durable."""
+    parent = Path(path).parent
+    parent.mkdir(exist_ok=True, parents=True)
     tmp = f"{path}.tmp"
-    with open(tmp, "w", encoding="utf-8") as fp:
-        _lock_exclusive(fp)
-        json.dump(data, fp, indent=2)
+    with open(tmp, "wb") as fp:
+        fp.write(_json_dumps(data))
         fp.flush()
-        os.fsync(fp.fileno())
-        _unlock(fp)
-    Path(tmp).replace(path)
+        if durable:
+            os.fsync(fp.fileno())
+    # The temp file is private, so no lock: the same-filesystem rename is atomic.
+    os.replace(tmp, path)
+    if durable and os.name == "posix":
+        dir_fd = os.open(parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _normalize_certs(hashes: Optional[List[str]]) -> Tuple[str, ...]:
+    """Canonicalize signing cert hashes so they compare with a single ``!=``."""
+    return tuple(sorted(hashes or ()))
+
+
+class AppRecord:
+    """Known state of a single app; slots keep large repos compact in memory."""
+
+    __slots__ = ("name", "min_version_code", "signing_cert_hashes", "last_seen", "repo_timestamp")
+
+    def __init__(
+        self,
+        name: Optional[str],
+        min_version_code: Optional[int],
+        signing_cert_hashes: Tuple[str, ...],
+        last_seen: Optional[str],
+        repo_timestamp: Optional[int],
+    ):
+        self.name = name
+        self.min_version_code = min_version_code
+        self.signing_cert_hashes = signing_cert_hashes
+        self.last_seen = last_seen
+        self.repo_timestamp = repo_timestamp
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "AppRecord":
+        return cls(
+            data.get("name"),
+            data.get("min_version_code"),
+            _normalize_certs(data.get("signing_cert_hashes")),
+            data.get("last_seen"),
+            data.get("repo_timestamp"),
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
 
 
-def load_known_apps(path: str) -> Tuple[Dict[str, Dict[str, Any]], bool]:
-    """Load known apps state from file, return (data, file_existed)."""
+def load_known_apps(
+    path: str,
+) -> Tuple[Dict[str, AppRecord], Dict[str, str], bool]:
+    """Load known apps state from file, return (apps, http_cache, file_existed)."""
     if not Path(path).exists():
-        return {}, False
-    with open(path, encoding="utf-8") as fp:
+        return {}, {}, False
+    with open(path, "rb") as fp:
         _lock_shared(fp)
         try:
-            data: Dict[str, Dict[str, Any]] = json.load(fp)
-        except json.JSONDecodeError:
-            logging.error("State file corrupted; starting fresh (%s)", path)
-            data = {}
+            size = os.fstat(fp.fileno()).st_size
+            # Writers replace the file by rename, so the mapping stays valid unlocked.
+            mm = mmap.mmap(fp.fileno(), size, access=mmap.ACCESS_READ) if size else None
         finally:
             _unlock(fp)
-        return data, True
+    try:
+        if mm is None:
+            raise json.JSONDecodeError("Empty state file", "", 0)
+        with memoryview(mm) as buf:
+            data: Dict[str, Any] = _json_loads(buf)
+    except json.JSONDecodeError:
+        logger.error("State file corrupted; starting fresh (%s)", path)
+        data = {}
+    finally:
+        if mm is not None:
+            mm.close()
+    if data.get("schema") == STATE_SCHEMA:
+        apps, http_cache = data.get("apps", {}), data.get("_http", {})
+    else:
+        # Legacy state files are a bare {pkg: meta} mapping.
+        apps, http_cache = data, {}
+    state = {sys.intern(pkg): AppRecord.from_json(meta) for pkg, meta in apps.items()}
+    return state, http_cache, True
+
 
+def save_known_apps(
+    path: str,
+    state: Dict[str, AppRecord],
+    http_cache: Dict[str, str],
+    *,
+    durable: bool = False,
+) -> None:
+    """Save known apps state and HTTP cache validators to file atomically."""
+    _atomic_json_dump(
+        path,
+        {
+            "schema": STATE_SCHEMA,
+            "_http": http_cache,
+            "apps": {pkg: record.to_json() for pkg, record in state.items()},
+        },
+        durable=durable,
+    )
 
-def save_known_apps(path: str, state: Dict[str, Dict[str, Any]]) -> None:
-    """Save known apps state to file atomically."""
-    _atomic_json_dump(path, state)
+
+def _build_record(
+    pkg: str,
+    meta: Any,
+    now_iso: str,
+    repo_ts: Optional[int],
+) -> Optional[AppRecord]:
+    """Return the state record for one fetched app, or None if it is invalid."""
+    if (
+        isinstance(meta, dict)
+        and meta.get("signing_cert_hashes") is not None
+        and meta.get("min_version_code") is not None
+    ):
+        return AppRecord(
+            meta.get("name"),
+            meta["min_version_code"],
+            _normalize_certs(meta["signing_cert_hashes"]),
+            now_iso,
+            repo_ts,
+        )
+    logger.warning("Invalid or incomplete metadata for %s", pkg)
+    return None
+
+
+def build_state(
+    apps: Dict[str, Any],
+    now_iso: str,
+    repo_ts: Optional[int],
+) -> Dict[str, AppRecord]:
+    """Validate fetched apps and build the state dict in a single pass."""
+    state: Dict[str, AppRecord] = {}
+    for pkg, meta in apps.items():
+        record = _build_record(pkg, meta, now_iso, repo_ts)
+        if record is not None:
+            state[sys.intern(pkg)] = record
+    return state
+
+
+def _iter_json_events(chunks: Iterable[bytes], hasher: Any) -> Iterator[Tuple[str, str, Any]]:
+    """Hash and incrementally parse response chunks, yielding ijson events."""
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    try:
+        for chunk in chunks:
+            hasher.update(chunk)
+            parser.send(chunk)
+            yield from events
+            del events[:]
+        parser.close()
+    except ijson.JSONError as exc:
+        raise ValueError(f"Invalid JSON in response: {exc}") from exc
+    yield from events
+
+
+def _stream_state(
+    chunks: Iterable[bytes],
+    hasher: Any,
+    now_iso: str,
+) -> Tuple[Dict[str, AppRecord], Optional[int]]:
+    """Build state while the repodata streams in, one app object at a time."""
+    state: Dict[str, AppRecord] = {}
+    repo_ts: Optional[int] = None
+    found_apps = late_ts = False
+    pkg, builder = None, None
+    for prefix, event, value in _iter_json_events(chunks, hasher):
+        if prefix == "apps":
+            if event == "start_map":
+                found_apps = True
+            elif builder is not None:
+                record = _build_record(pkg, builder.value, now_iso, repo_ts)
+                if record is not None:
+                    state[sys.intern(pkg)] = record
+                builder = None
+            if event == "map_key":
+                pkg, builder = value, ijson.ObjectBuilder()
+        elif builder is not None:
+            builder.event(event, value)
+        elif prefix == "timestamp" and event in ("number", "string", "null"):
+            repo_ts = value
+            late_ts = found_apps
+    if not found_apps:
+        raise ValueError("Missing 'apps' key in response")
+    if late_ts:
+        # The timestamp followed the apps object, so records were built without it.
+        for record in state.values():
+            record.repo_timestamp = repo_ts
+    return state, repo_ts
+
+
+def _retry_after_seconds(resp: httpx.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date."""
+    value = resp.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        # "-0000" zones parse as naive; HTTP dates are always UTC.
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def _should_stream(resp: httpx.Response) -> bool:
+    """Stream-parse only uncompressed bodies with a large declared Content-Length."""
+    # With a content-encoding the header is the compressed size, not the payload's.
+    if ijson is None or resp.headers.get("content-encoding", "identity") != "identity":
+        return False
+    try:
+        return int(resp.headers.get("content-length", 0)) >= STREAM_MIN_BYTES
+    except ValueError:
+        return False
 
 
 def fetch_apps(
     endpoint: str,
     client: httpx.Client,
+    now_iso: str,
+    http_cache: Optional[Dict[str, str]] = None,
     retries: int = 3,
     base_delay: int = 5,
     quiet: bool = False,
-) -> Tuple[Dict[str, Any], Optional[int]]:
-    """Fetch apps data from endpoint with exponential backoff retry."""
+    max_retry_after: float = 300.0,
+    wait: Optional[Callable[[float], bool]] = None,
+) -> Tuple[Any, Optional[int], Dict[str, str]]:
+    """Fetch apps state from endpoint with exponential backoff retry, or NOT_MODIFIED."""
+    http_cache = http_cache or {}
+    headers = {}
+    if http_cache.get("etag"):
+        headers["if-none-match"] = http_cache["etag"]
+    if http_cache.get("last_modified"):
+        headers["if-modified-since"] = http_cache["last_modified"]
+
     delay = base_delay
     for attempt in range(1, retries + 1):
         try:
             if not quiet:
                 print(f"Fetching {endpoint} (attempt {attempt}/{retries})")
-            resp = client.get(endpoint)
-            resp.raise_for_status()
-            data = resp.json()
-            if "apps" not in data:
-                raise ValueError("Missing 'apps' key in response")
-            return data["apps"], data.get("timestamp")
-        except (httpx.TimeoutException, httpx.RequestError, ValueError, json.JSONDecodeError) as exc:
+            with client.stream("GET", endpoint, headers=headers) as resp:
+                # Conditional GET hit: keep the cached validators and digest.
+                if resp.status_code == 304:
+                    return NOT_MODIFIED, None, {
+                        "etag": resp.headers.get("etag", http_cache.get("etag")),
+                        "last_modified": resp.headers.get("last-modified", http_cache.get("last_modified")),
+                        "digest": http_cache.get("digest"),
+                    }
+                resp.raise_for_status()
+                new_cache = {
+                    "etag": resp.headers.get("etag"),
+                    "last_modified": resp.headers.get("last-modified"),
+                }
+                hasher = hashlib.blake2b(digest_size=16)
+                # A body matching the cached digest also returns NOT_MODIFIED.
+                if _should_stream(resp):
+                    state, repo_ts = _stream_state(resp.iter_bytes(), hasher, now_iso)
+                    new_cache["digest"] = hasher.hexdigest()
+                    if new_cache["digest"] == http_cache.get("digest"):
+                        return NOT_MODIFIED, None, new_cache
+                else:
+                    body = resp.read()
+                    hasher.update(body)
+                    new_cache["digest"] = hasher.hexdigest()
+                    # Checked before decoding, so an identical body is never parsed.
+                    if new_cache["digest"] == http_cache.get("digest"):
+                        return NOT_MODIFIED, None, new_cache
+                    data = _json_loads(body)
+                    if "apps" not in data:
+                        raise ValueError("Missing 'apps' key in response")
+                    repo_ts = data.get("timestamp")
+                    state = build_state(data["apps"], now_iso, repo_ts)
+            return state, repo_ts, new_cache
+        except (
+            httpx.TimeoutException,
+            httpx.RequestError,
+            httpx.HTTPStatusError,
+            ValueError,
+            json.JSONDecodeError,
+        ) as exc:
+            # Retry 5xx and 429 (honoring a capped Retry-After); fail fast on other 4xx.
+            retry_after = None
+            if isinstance(exc, httpx.HTTPStatusError):
+                status = exc.response.status_code
+                if status < 500 and status != 429:
+                    raise
+                if status in (429, 503):
+                    retry_after = _retry_after_seconds(exc.response)
             msg = f"Error fetching apps: {exc}"
-            logging.warning(msg)
+            logger.warning(msg)
             if attempt == retries:
                 raise
-            jitter = random.uniform(0.5, 1.5)
-            sleep_time = delay * jitter
-            _emit(f"{msg}. Retrying in {sleep_time:.1f}s", quiet=quiet)
-            time.sleep(sleep_time)
+            if retry_after is not None:
+                sleep_time = min(retry_after, max_retry_after)
+            else:
+                jitter = random.uniform(0.5, 1.5)
+                sleep_time = delay * jitter
+            _emit("%s. Retrying in %.1fs", msg, sleep_time, quiet=quiet)
+            # wait() returns True on shutdown; give up with the last error.
+            if wait is None:
+                time.sleep(sleep_time)
+            elif wait(sleep_time):
+                raise
             delay *= 2
     raise RuntimeError("Unreachable fetch error path")
 
 
-def validate_app_metadata(apps: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
-    """Filter apps to only those with valid metadata."""
-    good: Dict[str, Dict[str, Any]] = {}
-    for pkg, meta in apps.items():
-        if (
-            isinstance(meta, dict)
-            and meta.get("signing_cert_hashes") is not None
-            and meta.get("min_version_code") is not None
-        ):
-            good[pkg] = meta
-        else:
-            logging.warning("Invalid or incomplete metadata for %s", pkg)
-    return good
-
-
 def diff_apps(
-    old: Dict[str, Dict[str, Any]],
-    new: Dict[str, Dict[str, Any]],
+    old: Dict[str, AppRecord],
+    new: Dict[str, AppRecord],
 ) -> Tuple[List[str], List[str], List[str], List[str]]:
     """Compare old and new app states, return sorted lists of changes."""
-    added = sorted(set(new) - set(old))
-    removed = sorted(set(old) - set(new))
+    old_keys, new_keys = old.keys(), new.keys()
+    added = sorted(new_keys - old_keys)
+    removed = sorted(old_keys - new_keys)
 
     updated: List[str] = []
     cert_changed: List[str] = []
 
-    for pkg in sorted(set(old) & set(new)):
+    for pkg in old_keys & new_keys:
         o, n = old[pkg], new[pkg]
-        if o.get("min_version_code") != n.get("min_version_code"):
+        if o.min_version_code != n.min_version_code:
             updated.append(pkg)
-        if set(o.get("signing_cert_hashes", [])) != set(n.get("signing_cert_hashes", [])):
+        if o.signing_cert_hashes != n.signing_cert_hashes:
             cert_changed.append(pkg)
+    updated.sort()
+    cert_changed.sort()
     return added, removed, updated, cert_changed
 
 
@@ -174,50 +485,69 @@ def notify(
     removed: List[str],
     updated: List[str],
     cert_changed: List[str],
-    old_state: Dict[str, Dict[str, Any]],
-    current: Dict[str, Dict[str, Any]],
+    old_state: Dict[str, AppRecord],
+    current: Dict[str, AppRecord],
     quiet: bool,
     timestamp: Optional[int] = None,
+    poll_ts_utc: Optional[str] = None,
 ) -> None:
-    """Emit notifications for app changes."""
+    """Emit notifications for app changes, batching console output."""
     if timestamp:
         now_utc = datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    elif poll_ts_utc:
+        now_utc = poll_ts_utc
     else:
         now_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
 
-    for pkg in added:
-        meta = current[pkg]
-        _emit(
-            f"[{now_utc}] NEW    : {pkg} ({meta.get('name')}) vc={meta.get('min_version_code')}",
-            quiet=quiet,
-        )
-
-    for pkg in removed:
-        meta = old_state.get(pkg, {})
-        _emit(
-            f"[{now_utc}] REMOVED: {pkg} ({meta.get('name')}) was vc={meta.get('min_version_code')}", 
-            level=logging.WARNING,
-            quiet=quiet,
-        )
-
-    for pkg in updated:
-        old, new = old_state[pkg], current[pkg]
-        _emit(
-            f"[{now_utc}] UPDATED: {pkg} ({new.get('name', old.get('name'))}) "
-            f"{old.get('min_version_code')} -> {new.get('min_version_code')}",
-            quiet=quiet,
-        )
-
-    for pkg in cert_changed:
-        meta = current[pkg]
-        _emit(
-            f"[{now_utc}] CERT  : {pkg} ({meta.get('name')}) signing cert changed!",
-            level=logging.WARNING,
-            quiet=quiet,
-        )
-
+    show_info = not quiet or logger.isEnabledFor(logging.INFO)
+    show_warning = not quiet or logger.isEnabledFor(logging.WARNING)
+
+    added_lines: List[str] = []
+    removed_lines: List[str] = []
+    updated_lines: List[str] = []
+    cert_lines: List[str] = []
+
+    if show_info:
+        for pkg in added:
+            record = current[pkg]
+            added_lines.append(f"[{now_utc}] NEW    : {pkg} ({record.name}) vc={record.min_version_code}")
+
+    if show_warning:
+        for pkg in removed:
+            record = old_state[pkg]
+            removed_lines.append(
+                f"[{now_utc}] REMOVED: {pkg} ({record.name}) was vc={record.min_version_code}"
+            )
+
+    if show_info:
+        for pkg in updated:
+            old, new = old_state[pkg], current[pkg]
+            updated_lines.append(
+                f"[{now_utc}] UPDATED: {pkg} ({new.name or old.name}) "
+                f"{old.min_version_code} -> {new.min_version_code}"
+            )
+
+    if show_warning:
+        for pkg in cert_changed:
+            cert_lines.append(f"[{now_utc}] CERT  : {pkg} ({current[pkg].name}) signing cert changed!")
 
-def print_summary(apps: Dict[str, Dict[str, Any]], quiet: bool) -> None:
+    if not quiet:
+        lines = added_lines + removed_lines + updated_lines + cert_lines
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+
+    for level, group in (
+        (logging.INFO, added_lines),
+        (logging.WARNING, removed_lines),
+        (logging.INFO, updated_lines),
+        (logging.WARNING, cert_lines),
+    ):
+        if group and logger.isEnabledFor(level):
+            for line in group:
+                logger.log(level, line)
+
+
+def print_summary(apps: Dict[str, AppRecord], quiet: bool) -> None:
     """Print repository summary on first run."""
     if quiet:
         return
@@ -225,7 +555,7 @@ def print_summary(apps: Dict[str, Dict[str, Any]], quiet: bool) -> None:
     print(f"   Total apps: {len(apps)}")
     sample = list(apps.items())[:5]
     for i, (pkg, info) in enumerate(sample, 1):
-        print(f"   {i}. {info.get('name')} - {pkg} (vc {info.get('min_version_code')})")
+        print(f"   {i}. {info.name} - {pkg} (vc {info.min_version_code})")
     if len(apps) > 5:
         print(f"   ... plus {len(apps) - 5} more")
 
@@ -234,11 +564,44 @@ class GracefulShutdown:
     """Handle graceful shutdown on SIGTERM/SIGINT."""
     def __init__(self):
         self.shutdown = False
+        # Self-pipe wakeup: a non-blocking send is safe inside a signal handler,
+        # unlike threading.Event.set(), which takes a non-reentrant lock.
+        self._wakeup_r, self._wakeup_w = socket.socketpair()
+        self._wakeup_w.setblocking(False)
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
 
     def _signal_handler(self, signum, frame):
         self.shutdown = True
+        try:
+            self._wakeup_w.send(b"\0")
+        except OSError:
+            pass
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; return True if shutdown was requested."""
+        if not self.shutdown:
+            select.select([self._wakeup_r], [], [], max(0.0, timeout))
+        return self.shutdown
+
+    def close(self) -> None:
+        """Close the wakeup socketpair."""
+        self._wakeup_r.close()
+        self._wakeup_w.close()
+
+
+def build_client(interval: int) -> httpx.Client:
+    """Create a pooled HTTP client whose keep-alive outlives the polling interval."""
+    return httpx.Client(
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        http2=_HTTP2,
+        limits=httpx.Limits(
+            max_keepalive_connections=4,
+            max_connections=4,
+            keepalive_expiry=max(interval * 1.5, 75.0),
+        ),
+        headers={"accept-encoding": _ACCEPT_ENCODING, "user-agent": USER_AGENT},
+    )
 
 
 def main() -> None:
@@ -249,46 +612,65 @@ def main() -> None:
     parser.add_argument("--state-file", default="known_apps.json")
     parser.add_argument("--log-file", default="app_updates.log")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    parser.add_argument("--no-log-file", action="store_true", help="Do not write a log file")
     parser.add_argument("--quiet", action="store_true")
     parser.add_argument("--once", action="store_true", help="Run once then exit")
     parser.add_argument("--max-failures", type=int, default=5, help="Max consecutive failures before exit")
     args = parser.parse_args()
 
-    setup_logging(args.log_file, args.log_level)
+    setup_logging(None if args.no_log_file else args.log_file, args.log_level)
 
-    state, file_existed = load_known_apps(args.state_file)
+    state, http_cache, file_existed = load_known_apps(args.state_file)
     first_run = not state or not file_existed
 
     shutdown_handler = GracefulShutdown()
 
     _emit(
-        f"Watcher started. Endpoint={args.endpoint}, interval={args.interval}s, once={args.once}",
+        "Watcher started. Endpoint=%s, interval=%ss, once=%s",
+        args.endpoint,
+        args.interval,
+        args.once,
         quiet=args.quiet,
     )
 
     poll = 0
     consecutive_failures = 0
-    client = httpx.Client(timeout=30.0)
+    # True while state or HTTP validators differ from what is durably on disk.
+    pending_save = False
+    client = build_client(args.interval)
     
     try:
         while not shutdown_handler.shutdown:
             poll += 1
             loop_start = time.monotonic()
-            ts_utc = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+            now_dt = datetime.now(timezone.utc)
+            ts_utc = now_dt.strftime("%Y-%m-%d %H:%M:%S UTC")
+            now_iso = now_dt.isoformat()
             if args.once:
-                _emit(f"[{ts_utc}] Checking once", quiet=args.quiet)
+                _emit("[%s] Checking once", ts_utc, quiet=args.quiet)
             else:
-                _emit(f"[{ts_utc}] Poll #{poll}", quiet=args.quiet)
+                _emit("[%s] Poll #%d", ts_utc, poll, quiet=args.quiet)
 
+            prev_cache = http_cache
             try:
-                raw, repo_ts = fetch_apps(args.endpoint, client, quiet=args.quiet)
+                current, repo_ts, http_cache = fetch_apps(
+                    args.endpoint,
+                    client,
+                    now_iso,
+                    None if first_run else http_cache,
+                    quiet=args.quiet,
+                    max_retry_after=args.interval,
+                    wait=shutdown_handler.wait,
+                )
                 consecutive_failures = 0
+                if http_cache != prev_cache:
+                    pending_save = True
             except Exception as exc:
                 consecutive_failures += 1
-                logging.exception("Fetch failed - will retry next cycle")
+                logger.exception("Fetch failed - will retry next cycle")
                 
                 if consecutive_failures >= args.max_failures:
-                    _emit(f"Max consecutive failures ({args.max_failures}) reached. Exiting.", 
+                    _emit("Max consecutive failures (%d) reached. Exiting.", args.max_failures,
                           level=logging.ERROR, quiet=args.quiet)
                     sys.exit(1)
                 
@@ -300,50 +682,47 @@ def main() -> None:
                 jitter = random.uniform(0.8, 1.2)
                 sleep_time = extended_sleep * jitter
                 
-                _emit(f"Will retry in {sleep_time:.1f}s (backoff due to {consecutive_failures} failures)", 
+                _emit("Will retry in %.1fs (backoff due to %d failures)", sleep_time, consecutive_failures,
                       quiet=args.quiet)
                 
                 elapsed = time.monotonic() - loop_start
                 remaining_sleep = max(0, sleep_time - elapsed)
-                time.sleep(remaining_sleep)
+                shutdown_handler.wait(remaining_sleep)
                 continue
             else:
-                current = validate_app_metadata(raw)
-
-                if first_run:
-                    print_summary(current, args.quiet)
-
-                added, removed, updated, cert_changed = diff_apps(state, current)
-
-                if any((added, removed, updated, cert_changed)):
-                    _emit("Changes detected", quiet=args.quiet)
+                if current is NOT_MODIFIED:
+                    _emit("No changes (not modified)", quiet=args.quiet)
                 else:
-                    _emit("No changes", quiet=args.quiet)
-
-                notify(
-                    added=added,
-                    removed=removed,
-                    updated=updated,
-                    cert_changed=cert_changed,
-                    old_state=state,
-                    current=current,
-                    quiet=args.quiet,
-                    timestamp=repo_ts,
-                )
-
-                now_iso = datetime.now(timezone.utc).isoformat()
-                state = {
-                    pkg: {
-                        "name": meta.get("name"),
-                        "min_version_code": meta.get("min_version_code"),
-                        "signing_cert_hashes": meta.get("signing_cert_hashes", []),
-                        "last_seen": now_iso,
-                        "repo_timestamp": repo_ts,
-                    }
-                    for pkg, meta in current.items()
-                }
-                save_known_apps(args.state_file, state)
-                first_run = False
+                    if first_run:
+                        print_summary(current, args.quiet)
+
+                    added, removed, updated, cert_changed = diff_apps(state, current)
+
+                    changed = any((added, removed, updated, cert_changed))
+                    if changed:
+                        _emit("Changes detected", quiet=args.quiet)
+                    else:
+                        _emit("No changes", quiet=args.quiet)
+
+                    notify(
+                        added=added,
+                        removed=removed,
+                        updated=updated,
+                        cert_changed=cert_changed,
+                        old_state=state,
+                        current=current,
+                        quiet=args.quiet,
+                        timestamp=repo_ts,
+                        poll_ts_utc=ts_utc,
+                    )
+
+                    state = current
+                    # A poll that only refreshes last_seen is not worth a write.
+                    if changed or first_run:
+                        durable = first_run or args.once
+                        save_known_apps(args.state_file, state, http_cache, durable=durable)
+                        pending_save = not durable
+                    first_run = False
 
             if args.once:
                 break
@@ -352,19 +731,20 @@ def main() -> None:
             sleep_for = max(0, args.interval - elapsed)
             if not args.quiet:
                 print(f"Sleeping {sleep_for:.1f}s\n")
-            
-            start_sleep = time.monotonic()
-            while time.monotonic() - start_sleep < sleep_for:
-                if shutdown_handler.shutdown:
-                    break
-                time.sleep(min(1.0, sleep_for - (time.monotonic() - start_sleep)))
+
+            if shutdown_handler.wait(sleep_for):
+                break
 
     except KeyboardInterrupt:
         pass
     finally:
-        _emit("Saving state and exiting", quiet=args.quiet)
-        save_known_apps(args.state_file, state)
+        if pending_save:
+            _emit("Saving state and exiting", quiet=args.quiet)
+            save_known_apps(args.state_file, state, http_cache, durable=True)
+        else:
+            _emit("Exiting", quiet=args.quiet)
         client.close()
+        shutdown_handler.close()
 
 
 if __name__ == "__main__":